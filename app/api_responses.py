@@ -0,0 +1,84 @@
+from flask import request, Response
+import gzip
+import json
+import math
+import os
+
+# orjson is way faster than the stdlib encoder, use it if it's installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Brotli is optional too - we fall back to gzip without it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this aren't worth compressing
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+def clean_nans(data):
+    """Swap NaN/inf floats (pandas' empty CSV cells) for None so the JSON stays valid"""
+    if isinstance(data, float) and not math.isfinite(data):
+        return None
+    if isinstance(data, dict):
+        return {key: clean_nans(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [clean_nans(value) for value in data]
+    return data
+
+def dump_json(data, use_orjson=True):
+    """Turn data into JSON bytes, using orjson when we have it
+
+    Both encoders write NaN as null, so the output doesn't depend on what's installed.
+    """
+    if use_orjson and orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(clean_nans(data), separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+def pick_encoding(accept_encoding):
+    """Work out which compression the client prefers (brotli wins a tie with gzip)"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, *params = part.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get('*', 0)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best, best_quality = None, 0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(body, encoding):
+    """Compress a response body with the given encoding ('br' or 'gzip')"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=4)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+def json_response(data, status=200):
+    """Build a JSON response, compressed if it's big enough and the client allows it"""
+    body = dump_json(data)
+    headers = {'Content-Type': 'application/json', 'Vary': 'Accept-Encoding'}
+
+    if len(body) >= COMPRESSION_MIN_SIZE:
+        encoding = pick_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding:
+            body = compress(body, encoding)
+            headers['Content-Encoding'] = encoding
+
+    return Response(body, status=status, headers=headers)
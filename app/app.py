@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
 import azure.cognitiveservices.speech as speechsdk
 import pandas as pd
@@ -16,6 +16,13 @@ import tempfile
 import asyncio
 import aiohttp
 from concurrent.futures import ThreadPoolExecutor
+import time
+
+from api_responses import json_response
+from dictionaries import (
+    MEDICAL_TERMS_PATH, DICTIONARIES_DIR, DICTIONARY_NAME_RE, dictionary_path,
+    get_term_index, get_overlay_index, iter_term_entries, match_medical_terms
+)
 
 # Set up logging - helps us track what's happening
 logging.basicConfig(level=logging.INFO)
@@ -43,41 +50,59 @@ CORS(app)  # Enable CORS for all routes
 # Thread pool for CPU-intensive tasks
 thread_pool = ThreadPoolExecutor(max_workers=4)
 
-# Load up our medical terms from CSV
-MEDICAL_TERMS_PATH = Path(__file__).parent / "data" / "medical_terms.csv"
-medical_terms_df = pd.read_csv(MEDICAL_TERMS_PATH)
+def wants_expanded_terms():
+    """Check if the client asked for full term details instead of just codes"""
+    return request.args.get('expand', '').lower() in ('1', 'true', 'yes')
 
 # Make sure we have a place to store uploads
 UPLOADS_DIR = os.path.join(os.path.dirname(__file__), 'uploads')
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
-def load_medical_terms():
-    """Grab all the medical terms from our CSV file"""
+def requested_dictionary():
+    """Which overlay dictionary the request asked for (None means just the base terms)"""
+    return request.args.get('dictionary', '').strip().lower() or None
+
+def check_dictionary(dictionary, must_exist=True):
+    """Return an error response if the dictionary name is bad or unknown, else None"""
+    if dictionary is None:
+        return None
+    if not DICTIONARY_NAME_RE.match(dictionary):
+        return json_response({
+            'status': 'error',
+            'message': 'Dictionary names can only use letters, numbers, dashes and underscores'
+        }, 400)
+    if must_exist and not dictionary_path(dictionary).exists():
+        return json_response({
+            'status': 'error',
+            'message': f'No dictionary called {dictionary}'
+        }, 404)
+    return None
+
+def load_medical_terms(dictionary=None):
+    """Grab all the medical terms - the base list merged with the overlay if one is given"""
     try:
-        terms_file = os.path.join(os.path.dirname(__file__), 'data', 'medical_terms.csv')
-        df = pd.read_csv(terms_file)
-        # Map the CSV columns to our expected format
-        terms = df.apply(lambda row: {
-            'name': row['Term'],
-            'code': row['Code'],
-            'description': row['Description'],
-            'category': row['Category'].lower().replace(' ', '_')
-        }, axis=1).tolist()
-        return terms
+        return [entry[0] for entry in iter_term_entries(dictionary)]
     except Exception as e:
         logger.error(f"Oops! Couldn't load medical terms: {str(e)}")
         return []
 
-def save_medical_terms(df):
-    """Save our medical terms back to the CSV file"""
+def save_medical_terms(df, dictionary=None):
+    """Save our medical terms back to the base CSV (or the overlay's CSV)"""
     try:
-        terms_file = os.path.join(os.path.dirname(__file__), 'data', 'medical_terms.csv')
+        if dictionary:
+            DICTIONARIES_DIR.mkdir(parents=True, exist_ok=True)
+            terms_file = dictionary_path(dictionary)
+        else:
+            terms_file = MEDICAL_TERMS_PATH
         df.to_csv(terms_file, index=False)
         return True
     except Exception as e:
         logger.error(f"Uh oh, couldn't save medical terms: {str(e)}")
         return False
 
+# Build the shared base index up front so the first request doesn't pay for it
+get_term_index(MEDICAL_TERMS_PATH)
+
 def convert_to_wav(audio_file):
     """Convert any audio file to WAV format that Azure can understand"""
     try:
@@ -205,57 +230,6 @@ def transcribe_audio(audio_file):
                 logger.warning(f"Could not delete temp file {wav_file}: {str(cleanup_error)}")
         return None
 
-def match_medical_terms(text, medical_terms):
-    """Look through the text and find any medical terms we know about"""
-    if not text:
-        return {
-            "lab_tests": [],
-            "diagnoses": [],
-            "procedures": [],
-            "medications": [],
-            "treatments": []
-        }
-    
-    text = text.lower()
-    matched_terms = {
-        "lab_tests": [],
-        "diagnoses": [],
-        "procedures": [],
-        "medications": [],
-        "treatments": []
-    }
-    
-    # Split text into words for better matching
-    text_words = set(text.split())
-    
-    # Check each term we know about
-    for term in medical_terms:
-        term_name = term['name'].lower()
-        term_words = set(term_name.split())
-        
-        # Calculate similarity between term and text
-        # Using Jaccard similarity for word-level matching
-        intersection = len(text_words.intersection(term_words))
-        union = len(text_words.union(term_words))
-        similarity = intersection / union if union > 0 else 0
-        
-        # If similarity is above threshold or exact match
-        if similarity >= 0.5 or term_name in text:
-            category = term['category']
-            # Put it in the right category
-            if category == 'lab_test':
-                matched_terms['lab_tests'].append(term)
-            elif category == 'diagnosis':
-                matched_terms['diagnoses'].append(term)
-            elif category == 'procedure':
-                matched_terms['procedures'].append(term)
-            elif category == 'medication':
-                matched_terms['medications'].append(term)
-            elif category == 'treatment':
-                matched_terms['treatments'].append(term)
-    
-    return matched_terms
-
 # Routes for serving our web pages
 @app.route('/')
 def index():
@@ -275,30 +249,42 @@ def terms_page():
 # API endpoints
 @app.route('/api/terms', methods=['GET'])
 def get_terms():
-    """Get all the medical terms we know about"""
+    """Get all the medical terms we know about (pass ?dictionary=name for an overlay)"""
     try:
-        terms = load_medical_terms()
-        return jsonify({
+        # An overlay with no terms yet just shows the base list, so the terms
+        # page can still be used to add its first term
+        dictionary = requested_dictionary()
+        error = check_dictionary(dictionary, must_exist=False)
+        if error:
+            return error
+
+        terms = load_medical_terms(dictionary)
+        return json_response({
             'status': 'success',
             'data': terms
-        }), 200, {'Content-Type': 'application/json'}
+        })
     except Exception as e:
         logger.error(f"Couldn't get the terms: {str(e)}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': str(e)
-        }), 500, {'Content-Type': 'application/json'}
+        }, 500)
 
 @app.route('/api/terms', methods=['POST'])
 def add_term():
-    """Add a new medical term to our list"""
+    """Add a new medical term to our list (or to an overlay with ?dictionary=name)"""
     try:
+        dictionary = requested_dictionary()
+        error = check_dictionary(dictionary, must_exist=False)
+        if error:
+            return error
+
         # Make sure they sent us JSON
         if not request.is_json:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'Send us JSON, not something else'
-            }), 400, {'Content-Type': 'application/json'}
+            }, 400)
 
         term = request.json
         required_fields = ['name', 'code', 'description', 'category']
@@ -306,28 +292,41 @@ def add_term():
         # Check they gave us everything we need
         for field in required_fields:
             if field not in term:
-                return jsonify({
+                return json_response({
                     'status': 'error',
                     'message': f'Hey, you forgot to give us the {field}'
-                }), 400, {'Content-Type': 'application/json'}
-        
+                }, 400)
+
+        # A blank name would match all sorts of text, and a blank code can't be looked up
+        for field in ['name', 'code']:
+            if not str(term[field] or '').strip():
+                return json_response({
+                    'status': 'error',
+                    'message': f'The {field} can\'t be blank'
+                }, 400)
+
         # Make sure the category makes sense
         valid_categories = ['lab_test', 'diagnosis', 'procedure', 'medication', 'treatment']
         if term['category'] not in valid_categories:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': f'That category is no good. Try one of these: {", ".join(valid_categories)}'
-            }), 400, {'Content-Type': 'application/json'}
+            }, 400)
         
-        # Load up our existing terms
-        terms = load_medical_terms()
+        # Load up our existing terms - an overlay only stores its own terms, so
+        # reusing a base code there overrides the base term for that department
+        if dictionary:
+            overlay = get_overlay_index(dictionary)
+            terms = overlay.terms[:] if overlay else []
+        else:
+            terms = load_medical_terms()
         
         # Check if this code is already taken
         if term['code'] in [t['code'] for t in terms]:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'Oops, that code is already in use'
-            }), 409, {'Content-Type': 'application/json'}
+            }, 409)
         
         # Add the new term
         terms.append(term)
@@ -340,26 +339,26 @@ def add_term():
             'Description': term['description']
         } for term in terms])
         
-        if save_medical_terms(df):
-            return jsonify({
+        if save_medical_terms(df, dictionary):
+            return json_response({
                 'status': 'success',
                 'message': 'Great! Added your new term',
                 'data': term
-            }), 201, {'Content-Type': 'application/json'}
+            }, 201)
         else:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'Hmm, something went wrong saving that'
-            }), 500, {'Content-Type': 'application/json'}
+            }, 500)
             
     except Exception as e:
         logger.error(f"Something went wrong adding the term: {str(e)}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': str(e)
-        }), 500, {'Content-Type': 'application/json'}
+        }, 500)
 
-async def process_audio_async(audio_file):
+async def process_audio_async(audio_file, expand=False, dictionary=None):
     """Asynchronously process audio file and return transcription"""
     try:
         # Run CPU-intensive tasks in thread pool
@@ -374,8 +373,12 @@ async def process_audio_async(audio_file):
             return None
             
         # Process medical terms
-        medical_terms = load_medical_terms()
-        matched_terms = match_medical_terms(transcription, medical_terms)
+        started = time.perf_counter()
+        matched_terms = match_medical_terms(transcription, iter_term_entries(dictionary), expand)
+        logger.info(
+            f"Matched terms against {dictionary or 'base'} dictionary "
+            f"in {(time.perf_counter() - started) * 1000:.2f} ms"
+        )
         
         return {
             'transcription': transcription,
@@ -390,54 +393,59 @@ async def transcribe():
     """HTTP endpoint for audio transcription"""
     try:
         if 'audio' not in request.files:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'No audio file provided'
-            }), 400
+            }, 400)
         
         audio_file = request.files['audio']
         if not audio_file.filename:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'Empty file'
-            }), 400
+            }, 400)
         
         if not audio_file.filename.lower().endswith(('.wav', '.mp3')):
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'Unsupported file format. Please provide a WAV or MP3 file.'
-            }), 400
+            }, 400)
         
+        dictionary = requested_dictionary()
+        error = check_dictionary(dictionary)
+        if error:
+            return error
+
         try:
-            result = await process_audio_async(audio_file)
+            result = await process_audio_async(audio_file, wants_expanded_terms(), dictionary)
         except ValueError as ve:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': str(ve)
-            }), 400
+            }, 400)
         
         if result:
             if not result.get('transcription'):
-                return jsonify({
+                return json_response({
                     'status': 'error',
                     'message': 'No speech was detected in the audio'
-                }), 400
-            return jsonify({
+                }, 400)
+            return json_response({
                 'status': 'success',
                 'data': result
-            }), 200
+            })
         else:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'Failed to process audio'
-            }), 500
+            }, 500)
             
     except Exception as e:
         logger.error(f"Error in transcribe endpoint: {str(e)}", exc_info=True)
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': str(e)
-        }), 500
+        }, 500)
 
 if __name__ == '__main__':
     import hypercorn.asyncio
@@ -0,0 +1,158 @@
+import pandas as pd
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Shared base dictionary, plus per-department overlays (cardiology.csv, gi.csv, ...)
+MEDICAL_TERMS_PATH = Path(__file__).parent / "data" / "medical_terms.csv"
+DICTIONARIES_DIR = Path(__file__).parent / "data" / "dictionaries"
+DICTIONARY_NAME_RE = re.compile(r'^[a-z0-9_-]+$')
+
+class TermIndex:
+    """A dictionary's terms with the lowercased names and word sets worked out once"""
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.codes = {term['code'] for term in terms}
+        self.entries = []
+        for term in terms:
+            term_name = str(term['name']).lower()
+            self.entries.append((term, term_name, set(term_name.split())))
+
+    def approx_size(self):
+        """Rough memory footprint in bytes (terms, their strings and the word sets)"""
+        size = sys.getsizeof(self.entries) + sys.getsizeof(self.codes)
+        for term, term_name, term_words in self.entries:
+            size += sys.getsizeof(term) + sys.getsizeof(term_name) + sys.getsizeof(term_words)
+            size += sum(sys.getsizeof(value) for value in term.values())
+            size += sum(sys.getsizeof(word) for word in term_words)
+        return size
+
+# Built indexes keyed by CSV path, along with the file stamp they were built from
+term_indexes = {}
+term_indexes_lock = threading.Lock()
+
+def read_terms_csv(path):
+    """Read a terms CSV and map the columns to our expected format"""
+    df = pd.read_csv(path)
+    # Empty cells come back as NaN - make them None so they serialize as null
+    df = df.astype(object).where(df.notna(), None)
+    terms = []
+    for row in df.to_dict('records'):
+        # A term with no name would match any text containing "none", so skip it
+        if not all(str(row[column] or '').strip() for column in ('Term', 'Code', 'Category')):
+            logger.warning(f"Skipping term with a blank name, code or category in {path.name}: {row}")
+            continue
+        terms.append({
+            'name': row['Term'],
+            'code': row['Code'],
+            'description': row['Description'],
+            'category': row['Category'].lower().replace(' ', '_')
+        })
+    return terms
+
+def get_term_index(path):
+    """Get the index for a terms CSV, only rebuilding it when the file changes"""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with term_indexes_lock:
+        cached = term_indexes.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        started = time.perf_counter()
+        index = TermIndex(read_terms_csv(path))
+        term_indexes[path] = (stamp, index)
+        logger.info(
+            f"Built term index for {path.name}: {len(index.terms)} terms, "
+            f"~{index.approx_size() / 1024:.1f} KB, "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        return index
+
+def dictionary_path(dictionary):
+    """Where a named overlay dictionary lives on disk"""
+    return DICTIONARIES_DIR / f"{dictionary}.csv"
+
+def get_overlay_index(dictionary):
+    """The overlay index for a dictionary, or None if it has no CSV yet"""
+    path = dictionary_path(dictionary)
+    if not path.exists():
+        return None
+    return get_term_index(path)
+
+def iter_term_entries(dictionary=None):
+    """Walk the entries to match against: the shared base terms, then the overlay's
+
+    The merge happens as we go, so each overlay only costs its own index. An
+    overlay term replaces any base term with the same code.
+    """
+    base = get_term_index(MEDICAL_TERMS_PATH)
+    overlay = get_overlay_index(dictionary) if dictionary else None
+    if overlay is None:
+        yield from base.entries
+        return
+
+    for entry in base.entries:
+        if entry[0]['code'] not in overlay.codes:
+            yield entry
+    yield from overlay.entries
+
+def match_medical_terms(text, term_entries, expand=False):
+    """Look through the text and find any medical terms we know about
+
+    term_entries comes from iter_term_entries. By default we only hand back
+    term codes - pass expand=True to get the full term dicts instead.
+    """
+    if not text:
+        return {
+            "lab_tests": [],
+            "diagnoses": [],
+            "procedures": [],
+            "medications": [],
+            "treatments": []
+        }
+
+    text = text.lower()
+    matched_terms = {
+        "lab_tests": [],
+        "diagnoses": [],
+        "procedures": [],
+        "medications": [],
+        "treatments": []
+    }
+
+    # Split text into words for better matching
+    text_words = set(text.split())
+
+    # Check each term we know about (names and word sets are precomputed in the index)
+    for term, term_name, term_words in term_entries:
+        # Calculate similarity between term and text
+        # Using Jaccard similarity for word-level matching
+        intersection = len(text_words.intersection(term_words))
+        union = len(text_words) + len(term_words) - intersection
+        similarity = intersection / union if union > 0 else 0
+
+        # If similarity is above threshold or exact match
+        if similarity >= 0.5 or term_name in text:
+            category = term['category']
+            match = term if expand else term['code']
+            # Put it in the right category
+            if category == 'lab_test':
+                matched_terms['lab_tests'].append(match)
+            elif category == 'diagnosis':
+                matched_terms['diagnoses'].append(match)
+            elif category == 'procedure':
+                matched_terms['procedures'].append(match)
+            elif category == 'medication':
+                matched_terms['medications'].append(match)
+            elif category == 'treatment':
+                matched_terms['treatments'].append(match)
+
+    return matched_terms
@@ -0,0 +1,95 @@
+"""Measure memory and matching latency as the number of department overlays grows.
+
+Builds N synthetic overlay CSVs in a temp directory, then reports the shared
+base index size, total and per-overlay memory, and match_medical_terms timing.
+The base is shared, so only overlay memory counts as the per-tenant cost.
+--base-terms pads the base with synthetic terms to see how a real code set scales.
+Only imports the dictionary helpers, so it runs without Azure credentials:
+
+    python scripts/bench_dictionaries.py --tenants 1 10 50 --terms-per-overlay 20
+"""
+import argparse
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+import dictionaries  # noqa: E402
+
+CATEGORIES = ['Lab Test', 'Diagnosis', 'Procedure', 'Medication', 'Treatment']
+TEXT = ("patient with hypertension and type 2 diabetes had a cbc and ecg today, "
+        "started on aspirin and metformin, follow up for dept term 3 review")
+
+def write_overlay(directory, tenant, terms_per_overlay):
+    """A synthetic overlay: mostly new terms, plus one override of a base code"""
+    with open(directory / f"dept{tenant}.csv", 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Category', 'Term', 'Code', 'Description'])
+        writer.writerow(['Lab Test', f'Dept {tenant} CBC', 'LAB001', 'Department specific CBC'])
+        for i in range(terms_per_overlay - 1):
+            writer.writerow([
+                CATEGORIES[i % len(CATEGORIES)],
+                f'Dept Term {i} Variant {tenant}',
+                f'D{tenant}-{i:04d}',
+                f'Synthetic term {i} for department {tenant}'
+            ])
+
+def write_base(path, extra_terms):
+    """The real base terms plus some synthetic ones"""
+    with open(dictionaries.MEDICAL_TERMS_PATH, newline='') as f:
+        rows = list(csv.reader(f))
+    for i in range(extra_terms):
+        rows.append([CATEGORIES[i % len(CATEGORIES)], f'Base Term {i}', f'B-{i:06d}', f'Synthetic base term {i}'])
+    with open(path, 'w', newline='') as f:
+        csv.writer(f).writerows(rows)
+
+def time_matches(dictionary, repeat):
+    """Average milliseconds for one match_medical_terms call, and how many entries it walked"""
+    entries = sum(1 for _ in dictionaries.iter_term_entries(dictionary))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        dictionaries.match_medical_terms(TEXT, dictionaries.iter_term_entries(dictionary))
+    return (time.perf_counter() - started) * 1000 / repeat, entries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tenants', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--terms-per-overlay', type=int, default=20)
+    parser.add_argument('--base-terms', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    base_dir = tempfile.TemporaryDirectory()
+    if args.base_terms:
+        padded_base = Path(base_dir.name) / "medical_terms.csv"
+        write_base(padded_base, args.base_terms)
+        dictionaries.MEDICAL_TERMS_PATH = padded_base
+
+    base = dictionaries.get_term_index(dictionaries.MEDICAL_TERMS_PATH)
+    base_ms, base_terms = time_matches(None, args.repeat)
+    print(f"base (shared): {len(base.terms)} terms, {base.approx_size() / 1024:.1f} KB, "
+          f"match {base_ms:.3f} ms over {base_terms} entries")
+    print(f"{'tenants':>8}{'overlay KB total':>18}{'KB per overlay':>16}{'match ms':>10}{'entries':>9}")
+
+    for tenants in args.tenants:
+        with tempfile.TemporaryDirectory() as tmp:
+            dictionaries.DICTIONARIES_DIR = Path(tmp)
+            for tenant in range(tenants):
+                write_overlay(Path(tmp), tenant, args.terms_per_overlay)
+
+            names = [f"dept{tenant}" for tenant in range(tenants)]
+            overlay_size = sum(dictionaries.get_overlay_index(name).approx_size() for name in names)
+            timings = [time_matches(name, max(1, args.repeat // tenants)) for name in names]
+            match_ms = sum(ms for ms, _ in timings) / len(timings)
+            entries = timings[0][1]
+
+            print(f"{tenants:>8}{overlay_size / 1024:>18.1f}{overlay_size / tenants / 1024:>16.1f}"
+                  f"{match_ms:>10.3f}{entries:>9}")
+
+    base_dir.cleanup()
+
+if __name__ == '__main__':
+    main()
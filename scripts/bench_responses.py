@@ -0,0 +1,85 @@
+"""Compare response sizes and encode times for a batch of transcription results.
+
+Covers stdlib json vs orjson, expanded term dicts vs codes, and raw vs gzip/br.
+Only imports app/api_responses.py, so it runs without Azure credentials:
+
+    python scripts/bench_responses.py --results 50 --terms-per-result 10
+"""
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+import api_responses  # noqa: E402
+
+CATEGORY_KEYS = {
+    'lab_test': 'lab_tests',
+    'diagnosis': 'diagnoses',
+    'procedure': 'procedures',
+    'medication': 'medications',
+    'treatment': 'treatments',
+}
+
+def load_terms():
+    """Read the base terms CSV the same way the app does"""
+    with open(APP_DIR / "data" / "medical_terms.csv", newline='') as f:
+        return [{
+            'name': row['Term'],
+            'code': row['Code'],
+            'description': row['Description'],
+            'category': row['Category'].lower().replace(' ', '_')
+        } for row in csv.DictReader(f)]
+
+def build_batch(terms, results, terms_per_result, expand):
+    """A batch of transcription results, each with a handful of matched terms"""
+    batch = []
+    for i in range(results):
+        matched = {key: [] for key in CATEGORY_KEYS.values()}
+        for j in range(terms_per_result):
+            term = terms[(i + j) % len(terms)]
+            matched[CATEGORY_KEYS[term['category']]].append(term if expand else term['code'])
+        batch.append({
+            'transcription': f"patient {i} was seen today and reviewed with the attending physician",
+            'medical_terms': matched
+        })
+    return {'status': 'success', 'data': batch}
+
+def time_it(func, repeat):
+    """Average milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--results', type=int, default=50)
+    parser.add_argument('--terms-per-result', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    terms = load_terms()
+    encoders = [('stdlib', False)]
+    if api_responses.orjson is not None:
+        encoders.append(('orjson', True))
+    encodings = ['gzip'] + (['br'] if api_responses.brotli is not None else [])
+
+    print(f"{args.results} results x {args.terms_per_result} terms, {args.repeat} runs each")
+    print(f"{'payload':<10}{'encoder':<9}{'encoding':<10}{'bytes':>9}{'encode ms':>11}{'compress ms':>13}")
+    for payload_name, expand in [('expanded', True), ('codes', False)]:
+        payload = build_batch(terms, args.results, args.terms_per_result, expand)
+        for encoder_name, use_orjson in encoders:
+            body = api_responses.dump_json(payload, use_orjson=use_orjson)
+            encode_ms = time_it(lambda: api_responses.dump_json(payload, use_orjson=use_orjson), args.repeat)
+            print(f"{payload_name:<10}{encoder_name:<9}{'raw':<10}{len(body):>9}{encode_ms:>11.3f}{'-':>13}")
+            for encoding in encodings:
+                compressed = api_responses.compress(body, encoding)
+                compress_ms = time_it(lambda: api_responses.compress(body, encoding), args.repeat)
+                print(f"{payload_name:<10}{encoder_name:<9}{encoding:<10}{len(compressed):>9}{encode_ms:>11.3f}{compress_ms:>13.3f}")
+
+if __name__ == '__main__':
+    main()
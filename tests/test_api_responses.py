@@ -0,0 +1,93 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+import api_responses
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    monkeypatch.setattr(api_responses, 'brotli', object())
+
+
+@pytest.fixture
+def without_brotli(monkeypatch):
+    monkeypatch.setattr(api_responses, 'brotli', None)
+
+
+def test_pick_encoding_empty_header():
+    assert api_responses.pick_encoding('') is None
+
+
+def test_pick_encoding_prefers_highest_quality(with_brotli):
+    assert api_responses.pick_encoding('br;q=0.1, gzip;q=1.0') == 'gzip'
+    assert api_responses.pick_encoding('gzip;q=0.5, br') == 'br'
+
+
+def test_pick_encoding_breaks_ties_with_brotli(with_brotli):
+    assert api_responses.pick_encoding('gzip, deflate, br') == 'br'
+
+
+def test_pick_encoding_skips_q_zero(with_brotli):
+    assert api_responses.pick_encoding('br;q=0, gzip') == 'gzip'
+    assert api_responses.pick_encoding('br;q=0, gzip;q=0') is None
+
+
+def test_pick_encoding_reads_q_after_other_params(with_brotli):
+    assert api_responses.pick_encoding('br; level=1; q=0, gzip') == 'gzip'
+    assert api_responses.pick_encoding('gzip; level=1; q=0') is None
+    assert api_responses.pick_encoding('gzip;q=0.5;foo=1, br;q=0.4') == 'gzip'
+    assert api_responses.pick_encoding('br ; q = 0 , gzip') == 'gzip'
+
+
+def test_pick_encoding_wildcard(with_brotli):
+    assert api_responses.pick_encoding('*') == 'br'
+    assert api_responses.pick_encoding('*, br;q=0') == 'gzip'
+    assert api_responses.pick_encoding('*;q=0') is None
+
+
+def test_pick_encoding_without_brotli(without_brotli):
+    assert api_responses.pick_encoding('br') is None
+    assert api_responses.pick_encoding('br, gzip;q=0.5') == 'gzip'
+
+
+def test_dump_json_writes_nan_as_null():
+    data = {'description': float('nan'), 'code': 'LAB001'}
+    assert json.loads(api_responses.dump_json(data, use_orjson=False)) == {'description': None, 'code': 'LAB001'}
+    if api_responses.orjson is not None:
+        assert api_responses.dump_json(data) == api_responses.dump_json(data, use_orjson=False)
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def test_json_response_below_threshold_is_not_compressed(app, monkeypatch):
+    monkeypatch.setattr(api_responses, 'COMPRESSION_MIN_SIZE', 1024)
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = api_responses.json_response({'status': 'success'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert json.loads(response.get_data()) == {'status': 'success'}
+
+
+def test_json_response_above_threshold_is_compressed(app, monkeypatch, without_brotli):
+    monkeypatch.setattr(api_responses, 'COMPRESSION_MIN_SIZE', 10)
+    data = {'status': 'success', 'data': ['LAB001'] * 50}
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = api_responses.json_response(data, 201)
+    assert response.status_code == 201
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.get_data())) == data
+
+
+def test_json_response_without_accept_encoding(app, monkeypatch):
+    monkeypatch.setattr(api_responses, 'COMPRESSION_MIN_SIZE', 10)
+    data = {'status': 'success', 'data': ['LAB001'] * 50}
+    with app.test_request_context():
+        response = api_responses.json_response(data)
+    assert 'Content-Encoding' not in response.headers
+    assert json.loads(response.get_data()) == data
@@ -0,0 +1,79 @@
+import pytest
+
+import dictionaries
+
+
+@pytest.fixture
+def overlays_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dictionaries, 'DICTIONARIES_DIR', tmp_path)
+    monkeypatch.setattr(dictionaries, 'term_indexes', {})
+    return tmp_path
+
+
+def write_overlay(directory, name, rows):
+    lines = ['Category,Term,Code,Description'] + [','.join(row) for row in rows]
+    (directory / f"{name}.csv").write_text('\n'.join(lines) + '\n')
+
+
+def codes(entries):
+    return [entry[0]['code'] for entry in entries]
+
+
+def test_missing_overlay_falls_back_to_base(overlays_dir):
+    base = dictionaries.get_term_index(dictionaries.MEDICAL_TERMS_PATH)
+    assert dictionaries.get_overlay_index('newdept') is None
+    assert list(dictionaries.iter_term_entries('newdept')) == base.entries
+
+
+def test_overlay_adds_and_overrides_terms(overlays_dir):
+    write_overlay(overlays_dir, 'cardio', [
+        ('Procedure', 'Echocardiogram', 'PROC001', 'Cardiac Ultrasound'),
+        ('Diagnosis', 'Atrial Fibrillation', 'CARD-DX001', 'Irregular Heart Rhythm'),
+    ])
+    entries = list(dictionaries.iter_term_entries('cardio'))
+    assert codes(entries).count('PROC001') == 1
+    assert 'CARD-DX001' in codes(entries)
+
+    matched = dictionaries.match_medical_terms('atrial fibrillation, ecg and echocardiogram', entries)
+    assert matched['diagnoses'] == ['CARD-DX001']
+    # ECG is the base PROC001, which the overlay replaced with Echocardiogram
+    assert matched['procedures'] == ['PROC001']
+
+
+def test_overlay_index_is_cached_until_overlay_changes(overlays_dir):
+    write_overlay(overlays_dir, 'gi', [('Procedure', 'Sigmoidoscopy', 'GI-PROC001', 'Lower GI Exam')])
+    first = dictionaries.get_overlay_index('gi')
+    assert dictionaries.get_overlay_index('gi') is first
+
+    write_overlay(overlays_dir, 'gi', [
+        ('Procedure', 'Sigmoidoscopy', 'GI-PROC001', 'Lower GI Exam'),
+        ('Diagnosis', 'Crohns Disease', 'GI-DX001', 'Inflammatory Bowel Disease'),
+    ])
+    assert 'GI-DX001' in codes(dictionaries.iter_term_entries('gi'))
+
+
+def test_empty_cells_become_none(overlays_dir):
+    write_overlay(overlays_dir, 'ed', [('Diagnosis', 'Sepsis', 'ED-DX001', '')])
+    overlay = dictionaries.get_overlay_index('ed')
+    assert overlay.terms[0]['description'] is None
+
+
+def test_overlay_does_not_copy_base_entries(overlays_dir):
+    write_overlay(overlays_dir, 'cardio', [('Procedure', 'Echocardiogram', 'PROC001', 'Cardiac Ultrasound')])
+    base = dictionaries.get_term_index(dictionaries.MEDICAL_TERMS_PATH)
+    overlay = dictionaries.get_overlay_index('cardio')
+    assert len(overlay.entries) == 1
+    assert len(list(dictionaries.iter_term_entries('cardio'))) == len(base.entries)
+
+
+def test_blank_name_code_or_category_is_skipped(overlays_dir):
+    write_overlay(overlays_dir, 'ed', [
+        ('Diagnosis', '', 'ED-DX9', 'x'),
+        ('', 'Syncope', 'ED-DX10', 'Fainting'),
+        ('Diagnosis', 'Concussion', '', 'Head injury'),
+        ('Diagnosis', 'Sepsis', 'ED-DX001', 'Infection'),
+    ])
+    assert codes(dictionaries.get_overlay_index('ed').entries) == ['ED-DX001']
+    matched = dictionaries.match_medical_terms('patient reports none of the symptoms',
+                                               dictionaries.iter_term_entries('ed'))
+    assert matched['diagnoses'] == []